@@ -5,19 +5,26 @@ A professional Streamlit dashboard for analyzing mobile push campaign performanc
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
 from datetime import datetime, timedelta
+import hashlib
 import io
-from typing import Dict, List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, TYPE_CHECKING
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Plotly is imported inside the chart functions so the empty state doesn't pay for it
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
 
 # Import custom modules
-from config import COLORS, CHART_COLORS, THRESHOLDS, CUSTOM_CSS, CHART_CONFIG, DATE_RANGES
+from config import COLORS, CHART_COLORS, THRESHOLDS, get_custom_css, CHART_CONFIG, DATE_RANGES, MAX_CHART_POINTS, CHART_CANVAS_WIDTH
 from utils import (
     process_csv_file, calculate_push_metrics_summary,
     format_currency, format_number, format_percentage, get_trend_arrow,
-    get_date_range_data, parse_percentage, parse_timestamp
+    get_date_range_data, parse_percentage_series, parse_timestamp_series,
+    lttb_indices, m4_indices, resolve_metric_files, build_tidy_store, CSV_READ_OPTIONS
 )
 
 # Page configuration
@@ -28,18 +35,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Cache busting - force CSS reload
-import time
-cache_buster = int(time.time())
-
-# Apply custom CSS
-st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+# Apply custom CSS (must be emitted every run: Streamlit drops elements a rerun doesn't draw)
+st.markdown(get_custom_css(), unsafe_allow_html=True)
 
 # Initialize session state
 if 'uploaded_data' not in st.session_state:
     st.session_state.uploaded_data = {}
 if 'last_updated' not in st.session_state:
     st.session_state.last_updated = None
+if 'upload_digests' not in st.session_state:
+    st.session_state.upload_digests = {}
 
 def render_header():
     """Render the main header"""
@@ -54,6 +59,66 @@ def render_header():
     if hasattr(st.session_state, 'last_updated') and st.session_state.last_updated:
         st.caption(f"Last updated: {st.session_state.last_updated}")
 
+def _vec_parse_pct(s: pd.Series) -> pd.Series:
+    """parse_percentage_series, stored as float32 for uploads"""
+    return parse_percentage_series(s).astype('float32')
+
+@st.cache_data(show_spinner=False)
+def _parse_upload(name: str, data: bytes) -> pd.DataFrame:
+    """Parse an uploaded file, memoized on its name and raw bytes across reruns"""
+    if name.lower().endswith('.parquet'):
+        # Parquet carries its own dtypes; the passes below then mostly no-op
+        processed_df = pd.read_parquet(io.BytesIO(data), dtype_backend='pyarrow')
+    else:
+        processed_df = pd.read_csv(io.BytesIO(data), **CSV_READ_OPTIONS)
+
+    # Try to parse percentage columns
+    for col in processed_df.columns:
+        if pd.api.types.is_string_dtype(processed_df[col].dtype):
+            try:
+                # Check if column contains percentage values (string kernel, no str() boxing)
+                sample_values = processed_df[col].dropna().head(5)
+                if sample_values.str.contains('%', regex=False).any():
+                    processed_df[col] = _vec_parse_pct(processed_df[col])
+            except:
+                pass  # Skip if parsing fails
+
+    # Try to parse timestamp columns
+    ts_cols = [c for c in processed_df.columns if 'timestamp' in c.lower() or 'date' in c.lower()]
+    for col in ts_cols:
+        try:
+            processed_df[col] = parse_timestamp_series(processed_df[col])
+        except:
+            pass  # Skip if parsing fails
+
+    # Store time series sorted so date filtering can binary-search instead of masking
+    if 'timestamp' in processed_df.columns and pd.api.types.is_datetime64_dtype(processed_df['timestamp']):
+        if not processed_df['timestamp'].is_monotonic_increasing:
+            processed_df = processed_df.sort_values('timestamp', kind='stable', ignore_index=True)
+
+    return processed_df
+
+def _parse_uploads(uploaded_files) -> List[Tuple[str, str, pd.DataFrame, Exception]]:
+    """
+    Parse uploads concurrently (the CSV/Parquet readers release the GIL), in upload order
+    Returns (name, digest, frame, None) per file, or (name, digest, None, error) if it
+    couldn't be parsed; digest identifies the file's bytes for the summary cache.
+    """
+    ctx = get_script_run_ctx()
+
+    def parse(uploaded_file):
+        # Worker threads need the session's context to use st.cache_data
+        add_script_run_ctx(threading.current_thread(), ctx)
+        data = uploaded_file.getvalue()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        try:
+            return uploaded_file.name, digest, _parse_upload(uploaded_file.name, data), None
+        except Exception as e:
+            return uploaded_file.name, digest, None, e
+
+    with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as pool:
+        return list(pool.map(parse, uploaded_files))
+
 def render_sidebar():
     """Render the sidebar with file upload and controls"""
     st.sidebar.title("📊 Dashboard Controls")
@@ -73,57 +138,33 @@ def render_sidebar():
             <li><strong>optout</strong><br/>Columns: timestamp, optout rate</li>
             <li><strong>campaigns</strong><br/>Campaign performance data</li>
         </ul>
-        <p><em>Works with .csv, .numbers, .xlsx, etc.</em></p>
+        <p><em>Works with .csv, .parquet, .numbers, .xlsx, etc.</em></p>
     </div>
     """, unsafe_allow_html=True)
     
     uploaded_files = st.sidebar.file_uploader(
         "Choose data files",
-        type=['csv', 'xlsx', 'xls', 'numbers'],
+        type=['csv', 'parquet', 'xlsx', 'xls', 'numbers'],
         accept_multiple_files=True,
         help="Upload all required data files for analysis"
     )
     
     # Process uploaded files - NO VALIDATION, just process whatever is uploaded
     if uploaded_files:
-        processed_data = {}
-        for uploaded_file in uploaded_files:
-            try:
-                df = pd.read_csv(uploaded_file)
-                processed_df = df.copy()
-                
-                # Try to parse percentage columns
-                for col in processed_df.columns:
-                    if processed_df[col].dtype == 'object':
-                        try:
-                            # Check if column contains percentage values
-                            sample_values = processed_df[col].dropna().head(5)
-                            if any('%' in str(val) for val in sample_values):
-                                processed_df[col] = processed_df[col].apply(lambda x: parse_percentage(str(x)) if pd.notna(x) else 0)
-                        except:
-                            pass  # Skip if parsing fails
-                
-                # Try to parse timestamp columns
-                for col in processed_df.columns:
-                    if 'timestamp' in col.lower() or 'date' in col.lower():
-                        try:
-                            processed_df[col] = processed_df[col].apply(parse_timestamp)
-                        except:
-                            pass  # Skip if parsing fails
-                
-                processed_data[uploaded_file.name] = processed_df
-                st.sidebar.success(f"✅ {uploaded_file.name} uploaded successfully")
-                
-            except Exception as e:
-                st.sidebar.warning(f"⚠️ Could not process {uploaded_file.name}: {str(e)}")
-                # Still add the file even if processing fails
-                try:
-                    processed_data[uploaded_file.name] = pd.read_csv(uploaded_file)
-                except:
-                    pass
-        
+        processed_data, digests = {}, {}
+        for name, digest, df, error in _parse_uploads(uploaded_files):
+            if error is None:
+                processed_data[name] = df
+                digests[name] = digest
+                st.sidebar.success(f"✅ {name} uploaded successfully")
+            else:
+                st.sidebar.warning(f"⚠️ Could not process {name}: {str(error)}")
+
         if processed_data:
             st.session_state.uploaded_data = processed_data
+            st.session_state.upload_digests = digests
+            st.session_state.resolved = resolve_metric_files(processed_data)
+            st.session_state.tidy = build_tidy_store(st.session_state.resolved)
             st.session_state.last_updated = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             st.sidebar.success("🎉 Files uploaded successfully!")
             
@@ -135,32 +176,25 @@ def render_sidebar():
     st.sidebar.markdown("### 📅 Date Range Filter")
     
     if hasattr(st.session_state, 'uploaded_data') and st.session_state.uploaded_data:
-        # Get date range from data
-        all_dates = []
+        # Get date range from data (one reduction per file, NaT skipped)
+        mins, maxs = [], []
         for df in st.session_state.uploaded_data.values():
             if 'timestamp' in df.columns and not df.empty:
-                all_dates.extend(df['timestamp'].dropna().tolist())
+                ts_min, ts_max = df['timestamp'].min(), df['timestamp'].max()
+                if pd.notna(ts_min):
+                    mins.append(ts_min)
+                    maxs.append(ts_max)
         
-        if all_dates:
-            min_date = min(all_dates)
-            max_date = max(all_dates)
-            
-            # Quick select buttons
-            col1, col2 = st.sidebar.columns(2)
-            with col1:
-                if st.button("7 Days"):
-                    st.session_state.date_range = (max_date - timedelta(days=7), max_date)
-            with col2:
-                if st.button("30 Days"):
-                    st.session_state.date_range = (max_date - timedelta(days=30), max_date)
+        if mins:
+            min_date = min(mins)
+            max_date = max(maxs)
             
-            col3, col4 = st.sidebar.columns(2)
-            with col3:
-                if st.button("90 Days"):
-                    st.session_state.date_range = (max_date - timedelta(days=90), max_date)
-            with col4:
-                if st.button("All Time"):
-                    st.session_state.date_range = (min_date, max_date)
+            # Quick select buttons, two per row
+            cols = st.sidebar.columns(2)
+            for i, (label, days) in enumerate(DATE_RANGES.items()):
+                if cols[i % 2].button(label.replace('Last ', '')):
+                    start = max_date - timedelta(days=days) if days else min_date
+                    st.session_state.date_range = (start, max_date)
             
             # Date picker
             date_range = st.sidebar.date_input(
@@ -180,13 +214,16 @@ def render_sidebar():
         st.sidebar.markdown("### 🗑️ Data Management")
         if st.sidebar.button("Clear All Data", type="secondary"):
             st.session_state.uploaded_data = {}
+            st.session_state.upload_digests = {}
+            st.session_state.resolved = {}
+            st.session_state.tidy = None
             st.session_state.last_updated = None
             if hasattr(st.session_state, 'date_range'):
                 st.session_state.date_range = None
             st.rerun()
 
-def render_metric_card(title: str, value: str, trend: Dict = None, icon: str = "📊"):
-    """Render a modern metric card with trend indicator"""
+def metric_card_html(title: str, value: str, trend: Dict = None, icon: str = "📊") -> str:
+    """Build the HTML for a modern metric card with trend indicator"""
     if trend:
         trend_arrow = get_trend_arrow(trend['direction'])
         trend_class = f"trend-{trend['direction']}"
@@ -195,7 +232,7 @@ def render_metric_card(title: str, value: str, trend: Dict = None, icon: str = "
         trend_class = "trend-neutral"
         trend_text = "➡️ No data"
     
-    st.markdown(f"""
+    return f"""
     <div class="metric-card">
         <div style="display: flex; justify-content: space-between; align-items: flex-start;">
             <div style="flex: 1;">
@@ -209,8 +246,28 @@ def render_metric_card(title: str, value: str, trend: Dict = None, icon: str = "
                 {icon}
             </div>
         </div>
-    </div>
-    """, unsafe_allow_html=True)
+    </div>"""
+
+def _data_fingerprint(data: Dict[str, pd.DataFrame], digests: Dict[str, str]) -> Tuple:
+    """
+    Content identity for the uploaded frames: name and digest of the uploaded bytes
+    The cache is shared by every session, so the key must change whenever any value does;
+    frames without a recorded digest are hashed row by row instead.
+    """
+    return tuple(
+        (name, digests.get(name) or int(pd.util.hash_pandas_object(df, index=False).sum()))
+        for name, df in data.items()
+    )
+
+@st.cache_data(show_spinner=False)
+def _cached_summary(fingerprint: Tuple, date_range, _data: Dict[str, pd.DataFrame]) -> Dict:
+    """calculate_push_metrics_summary memoized per (fingerprint, date_range); _data is not hashed"""
+    return calculate_push_metrics_summary(_data, date_range)
+
+def get_metrics_summary(date_range=None) -> Dict:
+    """Summary of the uploaded data, recomputed only when the data or date range changes"""
+    data = st.session_state.uploaded_data
+    return _cached_summary(_data_fingerprint(data, st.session_state.upload_digests), date_range, data)
 
 def render_metrics_cards():
     """Render the 8 key push notification metrics"""
@@ -219,149 +276,66 @@ def render_metrics_cards():
     
     # Calculate metrics
     date_range = st.session_state.get('date_range', None)
-    summary = calculate_push_metrics_summary(st.session_state.uploaded_data, date_range)
+    summary = get_metrics_summary(date_range)
     
-    # Create 4 columns for 8 metrics (2 rows of 4)
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
+    # 8 metrics, row-major in a 4-column grid (2 rows of 4)
+    cards = [
         # 1. Total Push Sends
-        sends = summary.get('total_sends', 0)
-        sends_trend = summary.get('sends_trend', {})
-        render_metric_card(
-            "Total Push Sends",
-            format_number(sends),
-            sends_trend,
-            "📤"
-        )
-        
-        # 5. Conversion Rate
-        conversion_rate = summary.get('conversion_rate', 0)
-        conversion_trend = summary.get('conversion_trend', {})
-        render_metric_card(
-            "Conversion Rate (%)",
-            format_percentage(conversion_rate),
-            conversion_trend,
-            "🎯"
-        )
-    
-    with col2:
+        metric_card_html("Total Push Sends", format_number(summary.get('total_sends', 0)),
+                         summary.get('sends_trend', {}), "📤"),
         # 2. Delivery Rate
-        delivery_rate = summary.get('delivery_rate', 0)
-        delivery_trend = summary.get('delivery_trend', {})
-        render_metric_card(
-            "Delivery Rate (%)",
-            format_percentage(delivery_rate),
-            delivery_trend,
-            "📨"
-        )
-        
-        # 6. Revenue from Push
-        revenue = summary.get('revenue_from_push', 0)
-        revenue_trend = summary.get('revenue_trend', {})
-        render_metric_card(
-            "Revenue from Push (AED)",
-            format_currency(revenue),
-            revenue_trend,
-            "💰"
-        )
-    
-    with col3:
+        metric_card_html("Delivery Rate (%)", format_percentage(summary.get('delivery_rate', 0)),
+                         summary.get('delivery_trend', {}), "📨"),
         # 3. Open Rate
-        open_rate = summary.get('open_rate', 0)
-        open_trend = summary.get('open_trend', {})
-        render_metric_card(
-            "Open Rate (%)",
-            format_percentage(open_rate),
-            open_trend,
-            "👁️"
-        )
-        
-        # 7. Opt-out Rate
-        optout_rate = summary.get('optout_rate', 0)
-        optout_trend = summary.get('optout_trend', {})
-        render_metric_card(
-            "Opt-out Rate (%)",
-            format_percentage(optout_rate),
-            optout_trend,
-            "🚫"
-        )
-    
-    with col4:
+        metric_card_html("Open Rate (%)", format_percentage(summary.get('open_rate', 0)),
+                         summary.get('open_trend', {}), "👁️"),
         # 4. Click-Through Rate
-        ctr = summary.get('ctr', 0)
-        ctr_trend = summary.get('ctr_trend', {})
-        render_metric_card(
-            "Click-Through Rate (%)",
-            format_percentage(ctr),
-            ctr_trend,
-            "👆"
-        )
-        
+        metric_card_html("Click-Through Rate (%)", format_percentage(summary.get('ctr', 0)),
+                         summary.get('ctr_trend', {}), "👆"),
+        # 5. Conversion Rate
+        metric_card_html("Conversion Rate (%)", format_percentage(summary.get('conversion_rate', 0)),
+                         summary.get('conversion_trend', {}), "🎯"),
+        # 6. Revenue from Push
+        metric_card_html("Revenue from Push (AED)", format_currency(summary.get('revenue_from_push', 0)),
+                         summary.get('revenue_trend', {}), "💰"),
+        # 7. Opt-out Rate
+        metric_card_html("Opt-out Rate (%)", format_percentage(summary.get('optout_rate', 0)),
+                         summary.get('optout_trend', {}), "🚫"),
         # 8. Top Performing Campaigns
-        top_campaigns = summary.get('top_campaigns_count', 0)
-        campaigns_trend = summary.get('campaigns_trend', {})
-        render_metric_card(
-            "Top Performing Campaigns",
-            f"{top_campaigns} Active",
-            campaigns_trend,
-            "🏆"
-        )
-
-def render_revenue_trend_chart():
-    """Render revenue trend chart for last 60 days"""
-    if not hasattr(st.session_state, 'uploaded_data'):
-        return
-    
-    # Find revenue file
-    revenue_file = None
-    for filename in st.session_state.uploaded_data.keys():
-        if 'push revenue' in filename.lower():
-            revenue_file = filename
-            break
-    
-    if not revenue_file:
-        return
-    
-    revenue_df = st.session_state.uploaded_data[revenue_file]
-    
-    # Find revenue and timestamp columns
-    revenue_col = None
-    timestamp_col = None
-    
-    for col in revenue_df.columns:
-        if 'revenue' in col.lower() and col.lower() != 'timestamp':
-            revenue_col = col
-        elif 'timestamp' in col.lower():
-            timestamp_col = col
-    
-    if revenue_col is None or timestamp_col is None:
-        return
-    
-    # Get last 60 days of data
-    if not revenue_df.empty and timestamp_col in revenue_df.columns:
-        # Remove any rows with null timestamps first
-        revenue_df_clean = revenue_df.dropna(subset=[timestamp_col])
-        
-        # Sort by timestamp and get last 60 days
-        revenue_df_sorted = revenue_df_clean.sort_values(timestamp_col)
-        if len(revenue_df_sorted) > 60:
-            revenue_df_sorted = revenue_df_sorted.tail(60)
-    
-    if revenue_df_sorted.empty:
-        return
+        metric_card_html("Top Performing Campaigns", f"{summary.get('top_campaigns_count', 0)} Active",
+                         summary.get('campaigns_trend', {}), "🏆"),
+    ]
     
-    fig = px.line(
-        revenue_df_sorted,
-        x=timestamp_col,
-        y=revenue_col,
-        title='Revenue Trend - Last 60 Days',
-        color_discrete_sequence=[CHART_COLORS['revenue']]
-    )
+    # One markdown element for the whole grid (no blank lines, so it stays raw HTML)
+    st.markdown(f'<div class="metric-grid">{"".join(cards)}\n</div>', unsafe_allow_html=True)
+
+def _m4_reduce(df: pd.DataFrame) -> pd.DataFrame:
+    """Cut a timestamp/value frame to the points visible at CHART_CANVAS_WIDTH"""
+    if len(df) <= 4 * CHART_CANVAS_WIDTH:
+        return df
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp')
+    return df.iloc[m4_indices(df['timestamp'], df['value'], CHART_CANVAS_WIDTH)]
+
+@st.cache_data(show_spinner=False)
+def _build_trend_figure(x: np.ndarray, y: np.ndarray, title: str, color: str, yaxis_title: str) -> 'go.Figure':
+    """Build a 60-day trend line figure, memoized on the plotted arrays and styling"""
+    import plotly.graph_objects as go
+    
+    fig = go.Figure(go.Scattergl(
+        x=x,
+        y=y,
+        mode='lines',
+        name=yaxis_title,
+        line=dict(color=color, width=3),
+        marker=dict(size=6)
+    ))
     
     fig.update_layout(
+        uirevision='keep',  # keep zoom/pan and let Plotly.react patch traces across reruns
+        title=title,
         xaxis_title="Date",
-        yaxis_title="Revenue (AED)",
+        yaxis_title=yaxis_title,
         hovermode='x unified',
         showlegend=False,
         height=400,
@@ -373,87 +347,79 @@ def render_revenue_trend_chart():
         )
     )
     
-    fig.update_traces(
-        line=dict(width=3),
-        marker=dict(size=6)
-    )
-    
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    return fig
 
-def render_purchases_trend_chart():
-    """Render purchases trend chart for last 60 days"""
-    if not hasattr(st.session_state, 'uploaded_data'):
+def render_revenue_trend_chart():
+    """Render revenue trend chart for last 60 days"""
+    tidy = st.session_state.get('tidy')
+    if tidy is None or tidy.empty:
         return
     
-    # Find purchases file
-    purchases_file = None
-    for filename in st.session_state.uploaded_data.keys():
-        if 'noofpurchasesattributedtopush' in filename.lower():
-            purchases_file = filename
-            break
+    revenue_df = tidy[tidy['metric'] == 'revenue']
     
-    if not purchases_file:
-        return
+    # Get last 60 days (by time, so denser series are downsampled, not truncated);
+    # select the window in one pass first so only its rows are sorted
+    if not revenue_df.empty:
+        window_start = revenue_df['timestamp'].max() - timedelta(days=60)
+        revenue_df = revenue_df[revenue_df['timestamp'] > window_start]
+    revenue_df_sorted = revenue_df.sort_values('timestamp')
     
-    purchases_df = st.session_state.uploaded_data[purchases_file]
+    # LTTB-downsample long series to the number of points the chart can actually show
+    if len(revenue_df_sorted) > MAX_CHART_POINTS:
+        keep = lttb_indices(revenue_df_sorted['timestamp'], revenue_df_sorted['value'], MAX_CHART_POINTS)
+        revenue_df_sorted = revenue_df_sorted.iloc[keep]
     
-    # Find purchases and timestamp columns
-    purchases_col = None
-    timestamp_col = None
+    if revenue_df_sorted.empty:
+        return
     
-    for col in purchases_df.columns:
-        if 'purchase' in col.lower() and col.lower() != 'timestamp':
-            purchases_col = col
-        elif 'timestamp' in col.lower():
-            timestamp_col = col
+    fig = _build_trend_figure(
+        revenue_df_sorted['timestamp'].to_numpy(),
+        revenue_df_sorted['value'].to_numpy(),
+        'Revenue Trend - Last 60 Days',
+        CHART_COLORS['revenue'],
+        "Revenue (AED)"
+    )
     
-    if purchases_col is None or timestamp_col is None:
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='revenue_trend_chart')
+
+def render_purchases_trend_chart():
+    """Render purchases trend chart for last 60 days"""
+    tidy = st.session_state.get('tidy')
+    if tidy is None or tidy.empty:
         return
     
-    # Get last 60 days of data
-    if not purchases_df.empty and timestamp_col in purchases_df.columns:
-        # Remove any rows with null timestamps first
-        purchases_df_clean = purchases_df.dropna(subset=[timestamp_col])
-        
-        # Sort by timestamp and get last 60 days
-        purchases_df_sorted = purchases_df_clean.sort_values(timestamp_col)
-        if len(purchases_df_sorted) > 60:
-            purchases_df_sorted = purchases_df_sorted.tail(60)
+    purchases_df = tidy[tidy['metric'] == 'purchases']
     
-    if purchases_df_sorted.empty:
-        return
+    # Get last 60 days (by time, so denser series are downsampled, not truncated);
+    # select the window in one pass first so only its rows are sorted
+    if not purchases_df.empty:
+        window_start = purchases_df['timestamp'].max() - timedelta(days=60)
+        purchases_df = purchases_df[purchases_df['timestamp'] > window_start]
+    purchases_df_sorted = purchases_df.sort_values('timestamp')
     
-    fig = px.line(
-        purchases_df_sorted,
-        x=timestamp_col,
-        y=purchases_col,
-        title='Conversion Trend - Last 60 Days',
-        color_discrete_sequence=[CHART_COLORS['purchases']]
-    )
+    # LTTB-downsample long series to the number of points the chart can actually show
+    if len(purchases_df_sorted) > MAX_CHART_POINTS:
+        keep = lttb_indices(purchases_df_sorted['timestamp'], purchases_df_sorted['value'], MAX_CHART_POINTS)
+        purchases_df_sorted = purchases_df_sorted.iloc[keep]
     
-    fig.update_layout(
-        xaxis_title="Date",
-        yaxis_title="Purchases",
-        hovermode='x unified',
-        showlegend=False,
-        height=400,
-        xaxis=dict(
-            type='date',
-            tickformat='%b %d, %Y',
-            tickmode='auto',
-            nticks=8
-        )
-    )
+    if purchases_df_sorted.empty:
+        return
     
-    fig.update_traces(
-        line=dict(width=3),
-        marker=dict(size=6)
+    fig = _build_trend_figure(
+        purchases_df_sorted['timestamp'].to_numpy(),
+        purchases_df_sorted['value'].to_numpy(),
+        'Conversion Trend - Last 60 Days',
+        CHART_COLORS['purchases'],
+        "Purchases"
     )
     
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='purchases_trend_chart')
 
 def render_purchases_buyers_chart():
     """Render purchases and buyers dual-axis chart"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     if not hasattr(st.session_state, 'uploaded_data'):
         return
     purchases_df = st.session_state.uploaded_data.get('noofpurchasesattributedtopush.csv', pd.DataFrame())
@@ -470,12 +436,18 @@ def render_purchases_buyers_chart():
         if not buyers_df.empty:
             buyers_df = get_date_range_data(buyers_df, start_date, end_date)
     
+    # Long ranges: keep only what the canvas can resolve
+    if not purchases_df.empty:
+        purchases_df = _m4_reduce(purchases_df)
+    if not buyers_df.empty:
+        buyers_df = _m4_reduce(buyers_df)
+    
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     
     # Add purchases line
     if not purchases_df.empty:
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=purchases_df['timestamp'],
                 y=purchases_df['value'],
                 name='Purchases',
@@ -488,7 +460,7 @@ def render_purchases_buyers_chart():
     # Add buyers line
     if not buyers_df.empty:
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=buyers_df['timestamp'],
                 y=buyers_df['value'],
                 name='Buyers',
@@ -500,6 +472,7 @@ def render_purchases_buyers_chart():
     
     # Update layout
     fig.update_layout(
+        uirevision='keep',
         title_text="Purchases & Buyers Over Time",
         height=400,
         hovermode='x unified'
@@ -509,10 +482,12 @@ def render_purchases_buyers_chart():
     fig.update_yaxes(title_text="Purchases", secondary_y=False)
     fig.update_yaxes(title_text="Buyers", secondary_y=True)
     
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='purchases_buyers_chart')
 
 def render_ctr_delivery_chart():
     """Render CTR and delivery rate chart"""
+    import plotly.graph_objects as go
+    
     if not hasattr(st.session_state, 'uploaded_data'):
         return
     ctr_df = st.session_state.uploaded_data.get('ctrrate.csv', pd.DataFrame())
@@ -529,11 +504,17 @@ def render_ctr_delivery_chart():
         if not delivery_df.empty:
             delivery_df = get_date_range_data(delivery_df, start_date, end_date)
     
+    # Long ranges: keep only what the canvas can resolve
+    if not ctr_df.empty:
+        ctr_df = _m4_reduce(ctr_df)
+    if not delivery_df.empty:
+        delivery_df = _m4_reduce(delivery_df)
+    
     fig = go.Figure()
     
     # Add CTR line
     if not ctr_df.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=ctr_df['timestamp'],
             y=ctr_df['value'],
             name='Click Through Rate',
@@ -543,7 +524,7 @@ def render_ctr_delivery_chart():
     
     # Add delivery rate line
     if not delivery_df.empty:
-        fig.add_trace(go.Scatter(
+        fig.add_trace(go.Scattergl(
             x=delivery_df['timestamp'],
             y=delivery_df['value'],
             name='Delivery Rate',
@@ -552,6 +533,7 @@ def render_ctr_delivery_chart():
         ))
     
     fig.update_layout(
+        uirevision='keep',
         title="CTR & Delivery Rate Over Time",
         xaxis_title="Date",
         yaxis_title="Percentage (%)",
@@ -559,10 +541,12 @@ def render_ctr_delivery_chart():
         hovermode='x unified'
     )
     
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='ctr_delivery_chart')
 
 def render_aov_chart():
     """Render AOV area chart"""
+    import plotly.express as px
+    
     if not hasattr(st.session_state, 'uploaded_data') or 'aovmobilepush.csv' not in st.session_state.uploaded_data:
         return
     
@@ -575,6 +559,7 @@ def render_aov_chart():
     
     if aov_df.empty:
         return
+    aov_df = _m4_reduce(aov_df)
     
     fig = px.area(
         aov_df,
@@ -585,6 +570,7 @@ def render_aov_chart():
     )
     
     fig.update_layout(
+        uirevision='keep',
         xaxis_title="Date",
         yaxis_title="AOV ($)",
         hovermode='x unified',
@@ -592,7 +578,7 @@ def render_aov_chart():
         height=400
     )
     
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='aov_chart')
 
 def render_campaign_performance_table():
     """Render campaign performance table"""
@@ -604,47 +590,46 @@ def render_campaign_performance_table():
     if campaign_df.empty:
         return
     
-    # Apply conditional formatting
-    def highlight_ctr(val):
-        if pd.isna(val):
-            return ''
-        if val > THRESHOLDS['ctr_high']:
-            return 'background-color: #d4edda; color: #155724'
-        elif val < THRESHOLDS['ctr_low']:
-            return 'background-color: #f8d7da; color: #721c24'
-        return ''
-    
-    def highlight_delivery_rate(val):
-        if pd.isna(val):
-            return ''
-        if val > THRESHOLDS['delivery_rate_high']:
-            return 'background-color: #d4edda; color: #155724'
-        elif val < THRESHOLDS['delivery_rate_low']:
-            return 'background-color: #f8d7da; color: #721c24'
-        return ''
-    
-    # Format the dataframe for display
-    display_df = campaign_df.copy()
-    
-    # Format percentage columns
-    if '#3 Delivery Rate' in display_df.columns:
-        display_df['#3 Delivery Rate'] = display_df['#3 Delivery Rate'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "N/A")
-    if '#4 Click Through Rate' in display_df.columns:
-        display_df['#4 Click Through Rate'] = display_df['#4 Click Through Rate'].apply(lambda x: f"{x:.1f}%" if pd.notna(x) else "N/A")
+    # Apply conditional formatting (column-wise, for Styler.apply)
+    def highlight_ctr(col):
+        values = pd.to_numeric(col, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return np.select(
+            [values > THRESHOLDS['ctr_high'], values < THRESHOLDS['ctr_low']],
+            ['background-color: #d4edda; color: #155724', 'background-color: #f8d7da; color: #721c24'],
+            default=''
+        )
+    
+    def highlight_delivery_rate(col):
+        values = pd.to_numeric(col, errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        return np.select(
+            [values > THRESHOLDS['delivery_rate_high'], values < THRESHOLDS['delivery_rate_low']],
+            ['background-color: #d4edda; color: #155724', 'background-color: #f8d7da; color: #721c24'],
+            default=''
+        )
     
     # Sort by delivered messages (descending)
-    if '#1 All Delivered' in display_df.columns:
-        display_df = display_df.sort_values('#1 All Delivered', ascending=False)
+    if '#1 All Delivered' in campaign_df.columns:
+        campaign_df = campaign_df.sort_values('#1 All Delivered', ascending=False)
+    
+    # Format percentage columns lazily at render time instead of copying the frame into strings
+    pct_cols = [col for col in ('#3 Delivery Rate', '#4 Click Through Rate') if col in campaign_df.columns]
+    styler = campaign_df.style.format({col: '{:.1f}%' for col in pct_cols}, na_rep='N/A')
+    if '#4 Click Through Rate' in campaign_df.columns:
+        styler = styler.apply(highlight_ctr, subset=['#4 Click Through Rate'])
+    if '#3 Delivery Rate' in campaign_df.columns:
+        styler = styler.apply(highlight_delivery_rate, subset=['#3 Delivery Rate'])
     
     st.markdown("### 📊 Campaign Performance Table")
     st.dataframe(
-        display_df,
+        styler,
         use_container_width=True,
         hide_index=True
     )
 
 def render_campaign_performance_chart():
     """Render top campaigns bar chart"""
+    import plotly.express as px
+    
     if not hasattr(st.session_state, 'uploaded_data') or 'promotionalcampaignlevelperformancepush.csv' not in st.session_state.uploaded_data:
         return
     
@@ -667,13 +652,14 @@ def render_campaign_performance_chart():
     )
     
     fig.update_layout(
+        uirevision='keep',
         xaxis_title="Messages Delivered",
         yaxis_title="Campaign Name",
         height=500,
         showlegend=False
     )
     
-    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG)
+    st.plotly_chart(fig, use_container_width=True, config=CHART_CONFIG, key='campaign_performance_chart')
 
 def render_download_section():
     """Render download reports section"""
@@ -688,7 +674,7 @@ def render_download_section():
         if st.button("📊 Download Summary Report (CSV)"):
             # Create summary report
             date_range = st.session_state.get('date_range', None)
-            summary = calculate_metrics_summary(st.session_state.uploaded_data, date_range)
+            summary = get_metrics_summary(date_range)
             
             # Convert to DataFrame
             summary_df = pd.DataFrame([summary])
@@ -708,7 +694,10 @@ def render_download_section():
             # Create Excel file with multiple sheets
             output = io.BytesIO()
             
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
+            # xlsxwriter serialises cells straight to XML instead of building an
+            # openpyxl object tree. constant_memory is left off: to_excel writes
+            # column by column, which that mode silently truncates.
+            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
                 for filename, df in st.session_state.uploaded_data.items():
                     sheet_name = filename.replace('.csv', '')[:31]  # Excel sheet name limit
                     df.to_excel(writer, sheet_name=sheet_name, index=False)
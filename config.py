@@ -3,8 +3,12 @@ Configuration file for Bloomreach Mobile Push Analytics Dashboard
 Contains color schemes, thresholds, and styling constants
 """
 
-# Color scheme for the dashboard
-COLORS = {
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+# Color scheme for the dashboard (read-only: shared by every session in the process)
+COLORS = MappingProxyType({
     'primary': '#1f77b4',
     'secondary': '#ff7f0e', 
     'success': '#2ca02c',
@@ -15,26 +19,29 @@ COLORS = {
     'dark': '#343a40',
     'white': '#ffffff',
     'gray': '#6c757d',
-    'light_gray': '#e9ecef'
-}
+    'light_gray': '#e9ecef',
+    'brand': '#667eea',
+    'brand_alt': '#764ba2',
+    'brand_dark': '#2d1b69'
+})
 
 # Chart colors
-CHART_COLORS = {
+CHART_COLORS = MappingProxyType({
     'revenue': '#1f77b4',
     'purchases': '#ff7f0e',
     'buyers': '#2ca02c',
     'ctr': '#d62728',
     'delivery_rate': '#9467bd',
     'aov': '#8c564b'
-}
+})
 
 # Performance thresholds
-THRESHOLDS = {
+THRESHOLDS = MappingProxyType({
     'ctr_high': 5.0,  # High CTR threshold (%)
     'ctr_low': 2.0,   # Low CTR threshold (%)
     'delivery_rate_high': 95.0,  # High delivery rate threshold (%)
     'delivery_rate_low': 80.0,   # Low delivery rate threshold (%)
-}
+})
 
 # File column mappings
 FILE_COLUMNS = {
@@ -72,6 +79,42 @@ FILE_COLUMNS = {
     }
 }
 
+# Freeze the nested mappings too; lookups go through resolve_schema (a single .get)
+FILE_COLUMNS = MappingProxyType({name: MappingProxyType(cols) for name, cols in FILE_COLUMNS.items()})
+KNOWN_FILES = frozenset(FILE_COLUMNS)
+
+def resolve_schema(filename: str):
+    """Column mapping for a known export filename, or None"""
+    return FILE_COLUMNS.get(filename)
+
+# Filename patterns -> canonical metric (first match wins, case-insensitive)
+METRIC_FILES = {
+    'push revenue': 'revenue',
+    'pushctr': 'ctr',
+    'pushdeliveryrate': 'delivery',
+    'pushaov': 'aov',
+    'noofpurchasesattributedtopush': 'purchases',
+    'pushsends': 'sends',
+    'sends': 'sends',
+    'opens': 'opens',
+    'openrate': 'opens',
+    'optout': 'optout',
+    'unsubscribe': 'optout',
+    'campaign': 'campaigns'
+}
+
+# Substrings identifying each metric's value column (case-insensitive)
+METRIC_VALUE_HINTS = {
+    'revenue': ('revenue',),
+    'ctr': ('ctr',),
+    'delivery': ('delivery',),
+    'aov': ('aov',),
+    'purchases': ('purchase',),
+    'sends': ('send', 'sent'),
+    'opens': ('open', 'rate'),
+    'optout': ('optout', 'unsubscribe')
+}
+
 # Date range presets
 DATE_RANGES = {
     'Last 7 Days': 7,
@@ -81,8 +124,7 @@ DATE_RANGES = {
 }
 
 # CSS styles - Modern Professional Dashboard (Updated: 2024-11-21)
-CUSTOM_CSS = """
-<style>
+_CSS_SOURCE = """
     /* Hide Streamlit default elements */
     #MainMenu {visibility: hidden;}
     footer {visibility: hidden;}
@@ -95,36 +137,14 @@ CUSTOM_CSS = """
         max-width: 1200px;
     }
     
-    /* Sidebar styling - Dark theme */
-    .css-1d391kg {
-        background-color: #2d1b69;
-    }
-    
-    .css-1d391kg .css-1v0mbdj {
-        background-color: #2d1b69;
-    }
-    
-    /* Sidebar text */
-    .css-1d391kg h1, .css-1d391kg h2, .css-1d391kg h3, 
-    .css-1d391kg p, .css-1d391kg div, .css-1d391kg label {
-        color: white !important;
-    }
-    
-    /* Sidebar file uploader */
-    .css-1d391kg .stFileUploader {
-        background-color: #3d2a79;
-        border-radius: 8px;
-        padding: 1rem;
-    }
-    
     /* Main content area */
     .main {
-        background-color: #f8f9fa;
+        background-color: var(--light);
     }
     
     /* Header styling */
     .dashboard-header {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        background: linear-gradient(135deg, var(--brand) 0%, var(--brand-alt) 100%);
         padding: 2rem;
         border-radius: 15px;
         color: white;
@@ -147,14 +167,21 @@ CUSTOM_CSS = """
     }
     
     /* Modern metric cards */
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 1rem;
+    }
+    
     .metric-card {
         background: white;
         padding: 1.5rem;
         border-radius: 12px;
         box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e9ecef;
+        border: 1px solid var(--light-gray);
         margin-bottom: 1rem;
-        transition: all 0.3s ease;
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
+        contain: layout style;
         position: relative;
         overflow: hidden;
     }
@@ -166,10 +193,11 @@ CUSTOM_CSS = """
         left: 0;
         right: 0;
         height: 4px;
-        background: linear-gradient(90deg, #667eea, #764ba2);
+        background: linear-gradient(90deg, var(--brand), var(--brand-alt));
     }
     
     .metric-card:hover {
+        will-change: transform;
         transform: translateY(-4px);
         box-shadow: 0 8px 30px rgba(0, 0, 0, 0.12);
     }
@@ -177,14 +205,14 @@ CUSTOM_CSS = """
     .metric-value {
         font-size: 2.2rem;
         font-weight: 700;
-        color: #2d1b69;
+        color: var(--brand-dark);
         margin: 0;
         line-height: 1.2;
     }
     
     .metric-label {
         font-size: 0.9rem;
-        color: #6c757d;
+        color: var(--gray);
         margin: 0 0 0.5rem 0;
         font-weight: 500;
         text-transform: uppercase;
@@ -209,35 +237,24 @@ CUSTOM_CSS = """
     }
     
     .trend-neutral {
-        color: #6c757d;
+        color: var(--gray);
         font-weight: 600;
     }
     
-    .trend-arrow {
-        font-size: 1.2rem;
-    }
-    
     /* Chart containers */
     .chart-container {
         background: white;
         padding: 2rem;
         border-radius: 12px;
         box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
-        border: 1px solid #e9ecef;
+        border: 1px solid var(--light-gray);
         margin-bottom: 2rem;
-    }
-    
-    .chart-title {
-        font-size: 1.3rem;
-        font-weight: 600;
-        color: #2d1b69;
-        margin-bottom: 1.5rem;
-        text-align: center;
+        contain: layout style;
     }
     
     /* Upload section */
     .upload-section {
-        background: linear-gradient(135deg, #f8f9fa 0%, #e9ecef 100%);
+        background: linear-gradient(135deg, var(--light) 0%, var(--light-gray) 100%);
         padding: 2rem;
         border-radius: 12px;
         border: 2px dashed #dee2e6;
@@ -246,43 +263,22 @@ CUSTOM_CSS = """
     }
     
     .upload-section h3 {
-        color: #2d1b69;
+        color: var(--brand-dark);
         margin-bottom: 1rem;
     }
     
-    /* Success/Error messages */
-    .success-message {
-        background: linear-gradient(135deg, #d4edda 0%, #c3e6cb 100%);
-        color: #155724;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #28a745;
-        margin: 0.5rem 0;
-        font-weight: 500;
-    }
-    
-    .error-message {
-        background: linear-gradient(135deg, #f8d7da 0%, #f5c6cb 100%);
-        color: #721c24;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #dc3545;
-        margin: 0.5rem 0;
-        font-weight: 500;
-    }
-    
     /* Empty state */
     .empty-state {
         text-align: center;
         padding: 4rem 2rem;
-        color: #6c757d;
+        color: var(--gray);
         background: white;
         border-radius: 12px;
         box-shadow: 0 4px 20px rgba(0, 0, 0, 0.08);
     }
     
     .empty-state h3 {
-        color: #2d1b69;
+        color: var(--brand-dark);
         margin-bottom: 1rem;
         font-size: 1.5rem;
     }
@@ -294,17 +290,18 @@ CUSTOM_CSS = """
     
     /* Buttons */
     .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        background: linear-gradient(135deg, var(--brand) 0%, var(--brand-alt) 100%);
         color: white;
         border: none;
         border-radius: 8px;
         padding: 0.75rem 1.5rem;
         font-weight: 600;
-        transition: all 0.3s ease;
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
         box-shadow: 0 4px 15px rgba(102, 126, 234, 0.3);
     }
     
     .stButton > button:hover {
+        will-change: transform;
         transform: translateY(-2px);
         box-shadow: 0 6px 20px rgba(102, 126, 234, 0.4);
     }
@@ -313,7 +310,7 @@ CUSTOM_CSS = """
     .section-header {
         font-size: 1.8rem;
         font-weight: 700;
-        color: #2d1b69;
+        color: var(--brand-dark);
         margin: 2rem 0 1.5rem 0;
         text-align: center;
         position: relative;
@@ -327,12 +324,16 @@ CUSTOM_CSS = """
         transform: translateX(-50%);
         width: 60px;
         height: 3px;
-        background: linear-gradient(90deg, #667eea, #764ba2);
+        background: linear-gradient(90deg, var(--brand), var(--brand-alt));
         border-radius: 2px;
     }
     
     /* Responsive design */
     @media (max-width: 768px) {
+        .metric-grid {
+            grid-template-columns: repeat(2, 1fr);
+        }
+        
         .metric-value {
             font-size: 1.8rem;
         }
@@ -345,9 +346,26 @@ CUSTOM_CSS = """
             padding: 1rem;
         }
     }
-</style>
 """
 
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+def _css_variables() -> str:
+    """COLORS as CSS custom properties (light_gray -> --light-gray)"""
+    props = ''.join(f"--{name.replace('_', '-')}:{value};" for name, value in COLORS.items())
+    return f":root{{{props}}}"
+
+@lru_cache(maxsize=None)
+def get_custom_css() -> str:
+    """The <style> block injected on every rerun, minified once per process"""
+    return f"<style>{_css_variables()}{_minify_css(_CSS_SOURCE)}</style>"
+
 # Chart configuration
 CHART_CONFIG = {
     'displayModeBar': True,
@@ -361,3 +379,10 @@ CHART_CONFIG = {
         'scale': 2
     }
 }
+
+
+# Maximum points drawn per trend line; longer series are LTTB-downsampled
+MAX_CHART_POINTS = 1000
+
+# Approximate plot width in pixels; full-range charts are M4-bucketed to 4 points per pixel column
+CHART_CANVAS_WIDTH = 1200
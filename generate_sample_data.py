@@ -3,147 +3,205 @@ Sample data generator for testing the Bloomreach Mobile Push Analytics Dashboard
 This script creates sample CSV files with realistic data for demonstration purposes
 """
 
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
+import argparse
+import json
 import os
+import sys
+from typing import TYPE_CHECKING
 
-def generate_sample_data():
-    """Generate sample CSV files for testing"""
+# pandas/numpy are imported inside generate_sample_data(), after the up-to-date check,
+# so cached runs and --help don't pay for them
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Generated files, without extension (.csv or .parquet depending on the output format)
+SAMPLE_FILES = (
+    'sample_revenue',
+    'sample_noofpurchasesattributedtopush',
+    'sample_noofcustomerswithpurchasesattributedtopush',
+    'sample_aovmobilepush',
+    'sample_ctrrate',
+    'sample_deliveryrate',
+    'sample_promotionalcampaignlevelperformancepush',
+)
+
+# Campaign names for the campaign performance file
+CAMPAIGN_NAMES = tuple(sys.intern(name) for name in (
+    "Summer Sale 2024", "Back to School", "Black Friday Prep", "Holiday Special",
+    "New Product Launch", "Flash Sale Weekend", "Customer Retention", "Win-back Campaign",
+    "Birthday Offers", "Loyalty Rewards", "Abandoned Cart", "Product Recommendations",
+    "Seasonal Clearance", "Member Exclusive", "Limited Time Offer"
+))
+
+# Lists every generated file with its column dtypes
+MANIFEST_FILE = 'sample_manifest.json'
+
+# Records what the files on disk were generated with; bump ver when the generator changes
+FINGERPRINT_FILE = '.sample_data_fp'
+GENERATOR_VERSION = 2
+
+# Compact output: day-resolution timestamps and two-decimal floats
+CSV_OPTIONS = {'index': False, 'date_format': '%Y-%m-%d', 'float_format': '%.2f'}
+
+def _read_fingerprint():
+    """Return the stored fingerprint, or None if there isn't one"""
+    try:
+        with open(FINGERPRINT_FILE) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _write_csv(df: 'pd.DataFrame', path: str):
+    """Write a CSV with Arrow's native writer when pyarrow is installed, else pandas"""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        df.to_csv(path, **CSV_OPTIONS)
+        return
+    
+    # Same compact output as CSV_OPTIONS: dates without a time part, floats to two decimals
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, pc.cast(table.column(i), pa.date32()))
+        elif pa.types.is_floating(field.type):
+            table = table.set_column(i, field.name, pc.round(table.column(i), 2))
+    pa_csv.write_csv(table, path, pa_csv.WriteOptions(quoting_style='needed'))
+
+def _write_sample(df: 'pd.DataFrame', stem: str, file_format: str, manifest: dict):
+    """Write one sample file in the chosen format and record its schema in the manifest"""
+    path = f"{stem}.{file_format}"
+    if file_format == 'parquet':
+        df.to_parquet(path, compression='zstd', index=False)
+    else:
+        _write_csv(df, path)
+    manifest[path] = {col: str(dtype) for col, dtype in df.dtypes.items()}
+    print(f"✅ Generated {path}")
+
+def generate_sample_data(file_format: str = 'csv'):
+    """Generate sample CSV (or Parquet) files for testing"""
+    
+    # Data is dated relative to today, so today is part of the fingerprint
+    fingerprint = f"seed=42,days=90,ver={GENERATOR_VERSION},date={datetime.now().date()},format={file_format}"
+    paths = [f"{stem}.{file_format}" for stem in SAMPLE_FILES]
+    if _read_fingerprint() == fingerprint and all(os.path.exists(path) for path in paths):
+        print("📊 Sample data is up to date, using cached files")
+        return
+    
+    import numpy as np
+    import pandas as pd
     
-    # Set random seed for reproducible data
-    np.random.seed(42)
+    # Seeded generator for reproducible data
+    rng = np.random.default_rng(42)
     
     # Generate date range (last 90 days)
     end_date = datetime.now()
     start_date = end_date - timedelta(days=90)
-    dates = pd.date_range(start=start_date, end=end_date, freq='D')
+    dates = pd.date_range(start=start_date, end=end_date, freq='D').normalize()
+    days = (dates - dates[0]).days.to_numpy()  # vectorized day offsets, no per-date Timestamp boxing
+    n = len(dates)
+    
+    # Shared by every series: position in the 90-day window, and one sine cycle per
+    # seasonality period so each series indexes days % period instead of calling np.sin
+    progress = days / 90
+    sine_cycle = {period: np.sin(2 * np.pi * np.arange(period) / period) for period in (7, 14, 21, 30)}
     
     print("📊 Generating sample data files...")
+    manifest = {}
     
     # 1. Revenue data
-    revenue_data = []
     base_revenue = 1000
-    for date in dates:
-        # Add some trend and seasonality
-        trend = 0.1 * (date - start_date).days / 90
-        seasonality = 200 * np.sin(2 * np.pi * (date - start_date).days / 7)  # Weekly pattern
-        noise = np.random.normal(0, 100)
-        revenue = max(0, base_revenue + trend * 500 + seasonality + noise)
-        revenue_data.append({'timestamp': date, 'Revenue from Mobile Push': revenue})
-    
-    revenue_df = pd.DataFrame(revenue_data)
-    revenue_df.to_csv('sample_revenue.csv', index=False)
-    print("✅ Generated sample_revenue.csv")
+    trend = 0.1 * progress
+    seasonality = 200 * sine_cycle[7][days % 7]  # Weekly pattern
+    noise = rng.normal(0, 100, n)
+    revenue = np.maximum(0, base_revenue + trend * 500 + seasonality + noise)
+    
+    revenue_df = pd.DataFrame({'timestamp': dates, 'Revenue from Mobile Push': revenue})
+    _write_sample(revenue_df, 'sample_revenue', file_format, manifest)
     
     # 2. Purchases data
-    purchases_data = []
     base_purchases = 50
-    for date in dates:
-        trend = 0.05 * (date - start_date).days / 90
-        seasonality = 10 * np.sin(2 * np.pi * (date - start_date).days / 7)
-        noise = np.random.normal(0, 5)
-        purchases = max(0, int(base_purchases + trend * 20 + seasonality + noise))
-        purchases_data.append({'timestamp': date, 'Purchases (Mobile Push)': purchases})
+    trend = 0.05 * progress
+    seasonality = 10 * sine_cycle[7][days % 7]
+    noise = rng.normal(0, 5, n)
+    purchases = np.maximum(0, (base_purchases + trend * 20 + seasonality + noise).astype(int))
     
-    purchases_df = pd.DataFrame(purchases_data)
-    purchases_df.to_csv('sample_noofpurchasesattributedtopush.csv', index=False)
-    print("✅ Generated sample_noofpurchasesattributedtopush.csv")
+    purchases_df = pd.DataFrame({'timestamp': dates, 'Purchases (Mobile Push)': purchases})
+    _write_sample(purchases_df, 'sample_noofpurchasesattributedtopush', file_format, manifest)
     
     # 3. Buyers data
-    buyers_data = []
-    for i, date in enumerate(dates):
-        # Buyers should be correlated with purchases but slightly lower
-        base_buyers = purchases_data[i]['Purchases (Mobile Push)'] * 0.8
-        noise = np.random.normal(0, 2)
-        buyers = max(0, int(base_buyers + noise))
-        buyers_data.append({'timestamp': date, '# Buyers': buyers})
-    
-    buyers_df = pd.DataFrame(buyers_data)
-    buyers_df.to_csv('sample_noofcustomerswithpurchasesattributedtopush.csv', index=False)
-    print("✅ Generated sample_noofcustomerswithpurchasesattributedtopush.csv")
+    # Buyers should be correlated with purchases but slightly lower
+    noise = rng.normal(0, 2, n)
+    buyers = np.maximum(0, (purchases * 0.8 + noise).astype(int))
+    
+    buyers_df = pd.DataFrame({'timestamp': dates, '# Buyers': buyers})
+    _write_sample(buyers_df, 'sample_noofcustomerswithpurchasesattributedtopush', file_format, manifest)
     
     # 4. AOV data
-    aov_data = []
     base_aov = 25
-    for date in dates:
-        trend = 0.02 * (date - start_date).days / 90
-        seasonality = 2 * np.sin(2 * np.pi * (date - start_date).days / 14)  # Bi-weekly pattern
-        noise = np.random.normal(0, 3)
-        aov = max(5, base_aov + trend * 5 + seasonality + noise)
-        aov_data.append({'timestamp': date, 'AOV (Mobile Push)': round(aov, 2)})
+    trend = 0.02 * progress
+    seasonality = 2 * sine_cycle[14][days % 14]  # Bi-weekly pattern
+    noise = rng.normal(0, 3, n)
+    aov = np.maximum(5, base_aov + trend * 5 + seasonality + noise)
     
-    aov_df = pd.DataFrame(aov_data)
-    aov_df.to_csv('sample_aovmobilepush.csv', index=False)
-    print("✅ Generated sample_aovmobilepush.csv")
+    aov_df = pd.DataFrame({'timestamp': dates, 'AOV (Mobile Push)': np.round(aov, 2)})
+    _write_sample(aov_df, 'sample_aovmobilepush', file_format, manifest)
     
     # 5. CTR data
-    ctr_data = []
     base_ctr = 3.5
-    for date in dates:
-        trend = 0.01 * (date - start_date).days / 90
-        seasonality = 0.5 * np.sin(2 * np.pi * (date - start_date).days / 30)  # Monthly pattern
-        noise = np.random.normal(0, 0.3)
-        ctr = max(0.5, min(8.0, base_ctr + trend * 2 + seasonality + noise))
-        ctr_data.append({'timestamp': date, 'Click Through Rate From Delivered - Push Notification': round(ctr, 2)})
+    trend = 0.01 * progress
+    seasonality = 0.5 * sine_cycle[30][days % 30]  # Monthly pattern
+    noise = rng.normal(0, 0.3, n)
+    ctr = np.clip(base_ctr + trend * 2 + seasonality + noise, 0.5, 8.0)
     
-    ctr_df = pd.DataFrame(ctr_data)
-    ctr_df.to_csv('sample_ctrrate.csv', index=False)
-    print("✅ Generated sample_ctrrate.csv")
+    ctr_df = pd.DataFrame({'timestamp': dates, 'Click Through Rate From Delivered - Push Notification': np.round(ctr, 2)})
+    _write_sample(ctr_df, 'sample_ctrrate', file_format, manifest)
     
     # 6. Delivery rate data
-    delivery_data = []
     base_delivery = 95
-    for date in dates:
-        trend = -0.005 * (date - start_date).days / 90  # Slight decline over time
-        seasonality = 1 * np.sin(2 * np.pi * (date - start_date).days / 21)  # 3-week pattern
-        noise = np.random.normal(0, 0.5)
-        delivery = max(85, min(99, base_delivery + trend * 2 + seasonality + noise))
-        delivery_data.append({'timestamp': date, 'Delivery Rate - Push Notification': round(delivery, 2)})
+    trend = -0.005 * progress  # Slight decline over time
+    seasonality = 1 * sine_cycle[21][days % 21]  # 3-week pattern
+    noise = rng.normal(0, 0.5, n)
+    delivery = np.clip(base_delivery + trend * 2 + seasonality + noise, 85, 99)
     
-    delivery_df = pd.DataFrame(delivery_data)
-    delivery_df.to_csv('sample_deliveryrate.csv', index=False)
-    print("✅ Generated sample_deliveryrate.csv")
+    delivery_df = pd.DataFrame({'timestamp': dates, 'Delivery Rate - Push Notification': np.round(delivery, 2)})
+    _write_sample(delivery_df, 'sample_deliveryrate', file_format, manifest)
     
     # 7. Campaign performance data
-    campaign_names = [
-        "Summer Sale 2024", "Back to School", "Black Friday Prep", "Holiday Special",
-        "New Product Launch", "Flash Sale Weekend", "Customer Retention", "Win-back Campaign",
-        "Birthday Offers", "Loyalty Rewards", "Abandoned Cart", "Product Recommendations",
-        "Seasonal Clearance", "Member Exclusive", "Limited Time Offer"
-    ]
-    
-    campaign_data = []
-    for campaign in campaign_names:
-        sent = np.random.randint(10000, 100000)
-        delivery_rate = np.random.uniform(88, 98)
-        delivered = int(sent * delivery_rate / 100)
-        ctr = np.random.uniform(1.5, 6.5)
-        clicked = int(delivered * ctr / 100)
-        
-        campaign_data.append({
-            'campaign_name': campaign,
-            '#0 All Sent': sent,
-            '#1 All Delivered': delivered,
-            '#2 All Clicked': clicked,
-            '#3 Delivery Rate': round(delivery_rate, 2),
-            '#4 Click Through Rate': round(ctr, 2)
-        })
-    
-    campaign_df = pd.DataFrame(campaign_data)
-    campaign_df.to_csv('sample_promotionalcampaignlevelperformancepush.csv', index=False)
-    print("✅ Generated sample_promotionalcampaignlevelperformancepush.csv")
+    # One batched draw per field across all campaigns, assembled column by column
+    n_campaigns = len(CAMPAIGN_NAMES)
+    sent = rng.integers(10000, 100000, size=n_campaigns)
+    delivery_rate = rng.uniform(88, 98, size=n_campaigns)
+    delivered = (sent * delivery_rate / 100).astype(np.int64)
+    ctr = rng.uniform(1.5, 6.5, size=n_campaigns)
+    clicked = (delivered * ctr / 100).astype(np.int64)
+    
+    campaign_df = pd.DataFrame({
+        'campaign_name': CAMPAIGN_NAMES,
+        '#0 All Sent': sent,
+        '#1 All Delivered': delivered,
+        '#2 All Clicked': clicked,
+        '#3 Delivery Rate': np.round(delivery_rate, 2),
+        '#4 Click Through Rate': np.round(ctr, 2)
+    })
+    _write_sample(campaign_df, 'sample_promotionalcampaignlevelperformancepush', file_format, manifest)
+    
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump({'format': file_format, 'files': manifest}, f, indent=2)
+    with open(FINGERPRINT_FILE, 'w') as f:
+        f.write(fingerprint)
     
     print("\n🎉 Sample data generation complete!")
     print("📁 Generated files:")
-    print("   - sample_revenue.csv")
-    print("   - sample_noofpurchasesattributedtopush.csv")
-    print("   - sample_noofcustomerswithpurchasesattributedtopush.csv")
-    print("   - sample_aovmobilepush.csv")
-    print("   - sample_ctrrate.csv")
-    print("   - sample_deliveryrate.csv")
-    print("   - sample_promotionalcampaignlevelperformancepush.csv")
+    for path in paths:
+        print(f"   - {path}")
     print("\n💡 You can now upload these files to test the dashboard!")
 
 if __name__ == "__main__":
-    generate_sample_data()
+    parser = argparse.ArgumentParser(description="Generate sample data for the dashboard")
+    parser.add_argument('--format', choices=('csv', 'parquet'), default=os.environ.get('SAMPLE_FORMAT', 'csv'),
+                        help="output format (default: $SAMPLE_FORMAT or csv); parquet keeps dtypes and needs pyarrow")
+    generate_sample_data(parser.parse_args().format)
@@ -2,7 +2,6 @@
 Demo script to run the Bloomreach Mobile Push Analytics Dashboard
 """
 
-import subprocess
 import sys
 import os
 
@@ -13,15 +12,21 @@ def main():
     print("📊 Upload your CSV files using the sidebar to get started")
     print("=" * 60)
     
+    # The demo doesn't edit app.py while running, so skip the source file watcher
+    os.environ.setdefault('STREAMLIT_SERVER_FILE_WATCHER_TYPE', 'none')
+    
     try:
-        # Run streamlit app
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "app.py"], check=True)
+        # Run streamlit app in this interpreter instead of spawning a second one
+        from streamlit.web import cli as stcli
+        sys.argv = ["streamlit", "run", "app.py"]
+        stcli.main()
     except KeyboardInterrupt:
         print("\n👋 Dashboard stopped by user")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error running dashboard: {e}")
-        print("💡 Make sure you have installed all requirements: pip install -r requirements.txt")
-    except FileNotFoundError:
+    except SystemExit as e:
+        if e.code not in (0, None):
+            print(f"❌ Error running dashboard: exit code {e.code}")
+            print("💡 Make sure you have installed all requirements: pip install -r requirements.txt")
+    except ImportError:
         print("❌ Streamlit not found. Please install it: pip install streamlit")
 
 if __name__ == "__main__":
@@ -5,52 +5,95 @@ Utility functions for data processing and analysis
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import importlib.util
+import io
+import math
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 import streamlit as st
 
+# Parse CSVs with the multithreaded Arrow reader when pyarrow is installed; it types
+# numeric and ISO timestamp columns itself, which the parsers below then pass through
+if importlib.util.find_spec('pyarrow') is not None:
+    CSV_READ_OPTIONS = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'}
+else:
+    CSV_READ_OPTIONS = {'engine': 'c', 'low_memory': False, 'cache_dates': True}
+
 def parse_percentage(value: str) -> float:
     """
     Parse percentage string to float value
     Examples: "95.5%" -> 95.5, "0.5%" -> 0.5
     """
-    if pd.isna(value) or value == '':
+    # Cheaper than pd.isna on scalars; NaN and NaT are the values unequal to themselves
+    if value is None or value is pd.NA or value != value or value == '':
         return 0.0
     
-    # Convert to string if not already
-    value_str = str(value).strip()
-    
-    # Remove percentage sign and convert to float
-    if '%' in value_str:
-        value_str = value_str.replace('%', '')
-    
+    # Remove percentage sign and convert to float (float() ignores surrounding whitespace)
     try:
-        return float(value_str)
+        return float(str(value).replace('%', ''))
     except (ValueError, TypeError):
         return 0.0
 
+def parse_percentage_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_percentage over a whole column
+    Same results per element: "95.5%" -> 95.5, missing or unparseable -> 0.0
+    """
+    # Columns the reader already typed as numbers skip the string round-trip
+    if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype(float).fillna(0.0)
+
+    stripped = values.astype('string').str.strip().str.replace('%', '', regex=False)
+    return pd.to_numeric(stripped, errors='coerce').fillna(0.0).astype(float)
+
+# Common timestamp formats, tried in order
+TIMESTAMP_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+    '%m/%d/%Y',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y',
+    '%d/%m/%Y %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%dT%H:%M:%SZ'
+]
+
+# String shape -> the TIMESTAMP_FORMATS that can parse it, in list order; one regex test
+# replaces trying every format (day and month fields may be one or two digits)
+_DATE = r'\d{4}-\d{1,2}-\d{1,2}'
+_SLASH_DATE = r'\d{1,2}/\d{1,2}/\d{4}'
+_TIME = r'\d{1,2}:\d{1,2}:\d{1,2}'
+_FORMAT_DETECTORS = [
+    (re.compile(_DATE), ('%Y-%m-%d',)),
+    (re.compile(f'{_DATE} {_TIME}'), ('%Y-%m-%d %H:%M:%S',)),
+    (re.compile(_SLASH_DATE), ('%m/%d/%Y', '%d/%m/%Y')),
+    (re.compile(f'{_SLASH_DATE} {_TIME}'), ('%m/%d/%Y %H:%M:%S', '%d/%m/%Y %H:%M:%S')),
+    (re.compile(f'{_DATE}T{_TIME}'), ('%Y-%m-%dT%H:%M:%S',)),
+    (re.compile(f'{_DATE}T{_TIME}Z'), ('%Y-%m-%dT%H:%M:%SZ',)),
+]
+
+def _candidate_formats(timestamp_str: str) -> Tuple[str, ...]:
+    """
+    Formats worth trying for a stripped timestamp string; empty if none fits its shape
+    """
+    for pattern, formats in _FORMAT_DETECTORS:
+        if pattern.fullmatch(timestamp_str):
+            return formats
+    return ()
+
+@lru_cache(maxsize=65536)
 def parse_timestamp(timestamp_str: str) -> datetime:
     """
     Parse various timestamp formats to datetime object
+    Memoized per string: exports repeat the same dates across many rows.
     """
     if pd.isna(timestamp_str):
         return None
     
     timestamp_str = str(timestamp_str).strip()
     
-    # Common timestamp formats
-    formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-        '%m/%d/%Y',
-        '%m/%d/%Y %H:%M:%S',
-        '%d/%m/%Y',
-        '%d/%m/%Y %H:%M:%S',
-        '%Y-%m-%dT%H:%M:%S',
-        '%Y-%m-%dT%H:%M:%SZ'
-    ]
-    
-    for fmt in formats:
+    for fmt in _candidate_formats(timestamp_str):
         try:
             return pd.to_datetime(timestamp_str, format=fmt)
         except (ValueError, TypeError):
@@ -62,59 +105,209 @@ def parse_timestamp(timestamp_str: str) -> datetime:
     except:
         return None
 
+def detect_timestamp_format(timestamp_str: str) -> Optional[str]:
+    """
+    Return the first of TIMESTAMP_FORMATS that parses the given string, or None
+    """
+    for fmt in _candidate_formats(timestamp_str):
+        try:
+            datetime.strptime(timestamp_str, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
+
+def parse_timestamp_series(values: pd.Series) -> pd.Series:
+    """
+    Vectorized parse_timestamp over a whole column, returned as naive datetime64[ns]
+    The format detected on the first value is tried on the whole column, then the rest of
+    TIMESTAMP_FORMATS on the rows still unparsed; whatever is left goes to parse_timestamp.
+    """
+    # Already typed (e.g. by the pyarrow reader); only normalize to naive datetimes
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        parsed = pd.to_datetime(values)
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_convert(None)
+        return parsed.astype('datetime64[ns]')
+
+    text = values.astype('string').str.strip()
+    valid = text.dropna()
+    first_fmt = detect_timestamp_format(valid.iloc[0]) if not valid.empty else None
+    formats = [first_fmt] if first_fmt else []
+    formats += [fmt for fmt in TIMESTAMP_FORMATS if fmt != first_fmt]
+
+    parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+    pending = text.notna()
+    for fmt in formats:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(text[pending], format=fmt, errors='coerce', cache=True)
+        pending &= parsed.isna()
+
+    if pending.any():
+        leftover = text[pending]
+        mapping = {value: _naive_ns(parse_timestamp(value)) for value in leftover.unique()}
+        parsed[pending] = leftover.map(mapping)
+    return parsed.astype('datetime64[ns]')
+
+def _naive_ns(timestamp) -> pd.Timestamp:
+    """
+    A parse_timestamp result as a naive timestamp that fits datetime64[ns], else NaT
+    Offsets are converted to UTC, matching the typed-column branch above.
+    """
+    if timestamp is None or pd.isna(timestamp):
+        return pd.NaT
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(None)
+    if not (pd.Timestamp.min <= timestamp <= pd.Timestamp.max):
+        return pd.NaT
+    return timestamp
+
+def _downcast(values: pd.Series) -> pd.Series:
+    """
+    Smallest integer dtype if every value is whole (counts); anything else stays float64,
+    since float32 can't hold currency amounts to the cent
+    """
+    return pd.to_numeric(values, downcast='integer')
+
 def process_csv_file(df: pd.DataFrame, filename: str) -> pd.DataFrame:
     """
     Process uploaded CSV file based on its type
+    Works on df in place (no defensive copy): pass a frame the caller won't reuse.
     """
     if df.empty:
         return df
     
     # Get column mapping for this file type
-    from config import FILE_COLUMNS
+    from config import resolve_schema
     
-    if filename not in FILE_COLUMNS:
+    column_mapping = resolve_schema(filename)
+    if column_mapping is None:
         return df
     
-    column_mapping = FILE_COLUMNS[filename]
-    processed_df = df.copy()
+    processed_df = df
     
     # Handle timestamp files (most files)
     if 'timestamp' in column_mapping and 'value' in column_mapping:
         timestamp_col = column_mapping['timestamp']
         value_col = column_mapping['value']
         
-        # Rename columns for consistency
-        if timestamp_col in processed_df.columns:
-            processed_df = processed_df.rename(columns={timestamp_col: 'timestamp'})
-        
-        if value_col in processed_df.columns:
-            processed_df = processed_df.rename(columns={value_col: 'value'})
+        # Rename columns for consistency (missing columns are ignored)
+        processed_df.rename(columns={timestamp_col: 'timestamp', value_col: 'value'}, inplace=True)
         
         # Parse timestamps
         if 'timestamp' in processed_df.columns:
-            processed_df['timestamp'] = processed_df['timestamp'].apply(parse_timestamp)
+            processed_df['timestamp'] = parse_timestamp_series(processed_df['timestamp'])
             processed_df = processed_df.dropna(subset=['timestamp'])
+            # Sorted by time so get_date_range_data can binary-search instead of masking
+            if not processed_df['timestamp'].is_monotonic_increasing:
+                processed_df = processed_df.sort_values('timestamp', kind='stable', ignore_index=True)
         
         # Parse percentage values
         if 'value' in processed_df.columns:
-            processed_df['value'] = processed_df['value'].apply(parse_percentage)
+            processed_df['value'] = _downcast(parse_percentage_series(processed_df['value']))
     
     # Handle campaign performance file
     elif filename == 'promotionalcampaignlevelperformancepush.csv':
         # Parse percentage columns
-        percentage_cols = ['#3 Delivery Rate', '#4 Click Through Rate']
-        for col in percentage_cols:
-            if col in processed_df.columns:
-                processed_df[col] = processed_df[col].apply(parse_percentage)
+        percentage_cols = [c for c in ['#3 Delivery Rate', '#4 Click Through Rate'] if c in processed_df.columns]
+        if percentage_cols:
+            processed_df[percentage_cols] = processed_df[percentage_cols].apply(parse_percentage_series)
         
         # Parse numeric columns
-        numeric_cols = ['#0 All Sent', '#1 All Delivered', '#2 All Clicked']
-        for col in numeric_cols:
-            if col in processed_df.columns:
-                processed_df[col] = pd.to_numeric(processed_df[col], errors='coerce').fillna(0)
+        numeric_cols = [c for c in ['#0 All Sent', '#1 All Delivered', '#2 All Clicked'] if c in processed_df.columns]
+        if numeric_cols:
+            processed_df[numeric_cols] = processed_df[numeric_cols].apply(
+                lambda col: pd.to_numeric(pd.to_numeric(col, errors='coerce').fillna(0), downcast='integer'))
+        
+        # Repeated campaign names are stored once per distinct value
+        if 'campaign_name' in processed_df.columns and processed_df['campaign_name'].nunique() < len(processed_df) // 2:
+            processed_df['campaign_name'] = processed_df['campaign_name'].astype('category')
     
     return processed_df
 
+@st.cache_data(show_spinner=False)
+def load_csv_file(file_bytes: bytes, filename: str) -> pd.DataFrame:
+    """
+    Read and process a CSV export, memoized on its raw bytes and filename across reruns
+    Library entry point for callers holding raw export bytes; the dashboard's own
+    upload path (app._parse_upload) doesn't go through it.
+    Known exports whose header has every schema column only parse those columns;
+    anything else (other files, renamed or missing columns) is read whole, as before.
+    """
+    from config import resolve_schema
+
+    column_mapping = resolve_schema(filename)
+    usecols = None
+    if column_mapping is not None:
+        # The Arrow reader takes no usecols callable and raises on listed columns the
+        # file lacks, so check the header line first
+        header = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+        wanted = frozenset(column_mapping.values())
+        if wanted.issubset(header):
+            usecols = [col for col in header if col in wanted]
+    return process_csv_file(pd.read_csv(io.BytesIO(file_bytes), usecols=usecols, **CSV_READ_OPTIONS), filename)
+
+def match_metric_key(filename: str) -> Optional[str]:
+    """
+    Canonical metric key for an uploaded filename (see config.METRIC_FILES), or None
+    """
+    from config import METRIC_FILES
+
+    filename_lower = filename.lower()
+    return next((metric for pattern, metric in METRIC_FILES.items() if pattern in filename_lower), None)
+
+def resolve_metric_files(data: Dict[str, pd.DataFrame]) -> Dict[str, Tuple[pd.DataFrame, Optional[str], Optional[str]]]:
+    """
+    Resolve uploaded files once into {metric: (df, timestamp_col, value_col)}
+    Later files for the same metric replace earlier ones, as in the metrics summary.
+    """
+    from config import METRIC_VALUE_HINTS
+
+    resolved = {}
+    for filename, df in data.items():
+        metric = match_metric_key(filename)
+        if metric is None:
+            continue
+
+        columns = df.columns.astype(str)
+        lower_cols = columns.str.lower()
+        timestamp_hits = columns[lower_cols.str.contains('timestamp', regex=False)]
+
+        value_col = None
+        hints = METRIC_VALUE_HINTS.get(metric)
+        if hints:
+            value_hits = columns[lower_cols.str.contains('|'.join(map(re.escape, hints))) & (lower_cols != 'timestamp')]
+            value_col = value_hits[0] if len(value_hits) else None
+
+        timestamp_col = timestamp_hits[0] if len(timestamp_hits) else None
+        resolved[metric] = (df, timestamp_col, value_col)
+
+    return resolved
+
+def build_tidy_store(resolved: Dict[str, Tuple[pd.DataFrame, Optional[str], Optional[str]]]) -> pd.DataFrame:
+    """
+    Normalize resolved time-series files (see resolve_metric_files) into one
+    long-form DataFrame with columns: metric, timestamp, value
+    """
+    frames = []
+    for metric, (df, timestamp_col, value_col) in resolved.items():
+        if timestamp_col is None or value_col is None or df.empty:
+            continue
+
+        frames.append(pd.DataFrame({
+            'metric': metric,
+            'timestamp': df[timestamp_col].to_numpy(),
+            'value': pd.to_numeric(df[value_col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        }).dropna(subset=['timestamp']))
+
+    if not frames:
+        return pd.DataFrame({'metric': pd.Categorical([]), 'timestamp': pd.to_datetime([]), 'value': pd.Series(dtype=float)})
+
+    tidy = pd.concat(frames, ignore_index=True)
+    tidy['metric'] = tidy['metric'].astype('category')
+    return tidy
+
 def calculate_trend(current_value: float, previous_value: float) -> Tuple[float, str]:
     """
     Calculate trend percentage and direction
@@ -137,15 +330,177 @@ def calculate_trend(current_value: float, previous_value: float) -> Tuple[float,
     
     return abs(percentage_change), direction
 
+def calculate_trends_batch(current_values, previous_values) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    calculate_trend over arrays of (current, previous) pairs in one vectorized pass
+    Returns: (percentage_changes, directions)
+    """
+    current = np.asarray(current_values, dtype=float)
+    previous = np.asarray(previous_values, dtype=float)
+    zero_previous = previous == 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (current - previous) / previous * 100
+    percentages = np.where(zero_previous, np.where(current > 0, 100.0, 0.0), np.abs(change))
+    
+    # Up/down from the sign of the change (a NaN change is neutral, as in calculate_trend)
+    sign = np.where(zero_previous, (current > 0).astype(float), np.sign(change))
+    directions = np.select([sign > 0, sign < 0], ['up', 'down'], 'neutral')
+    return percentages, directions
+
 def get_date_range_data(df: pd.DataFrame, start_date: datetime, end_date: datetime) -> pd.DataFrame:
     """
     Filter dataframe by date range
+    The result may be df itself or a view of it: callers must not mutate it.
     """
     if df.empty or 'timestamp' not in df.columns:
         return df
     
-    mask = (df['timestamp'] >= start_date) & (df['timestamp'] <= end_date)
-    return df[mask].copy()
+    timestamps = df['timestamp']
+    # Parsed timestamps are naive datetime64[ns]: compare raw ndarray values, no Timestamp boxing
+    if timestamps.dtype == 'datetime64[ns]':
+        ts = timestamps.to_numpy()
+        start, end = np.datetime64(pd.Timestamp(start_date), 'ns'), np.datetime64(pd.Timestamp(end_date), 'ns')
+        # Uploads are stored sorted by timestamp: binary-search the bounds and slice,
+        # or hand back df as is when the range covers all of it (e.g. 'All Time')
+        if timestamps.is_monotonic_increasing:
+            if ts[0] >= start and ts[-1] <= end:
+                return df
+            return df.iloc[np.searchsorted(ts, start, side='left'):np.searchsorted(ts, end, side='right')]
+        mask = (ts >= start) & (ts <= end)
+        return df if mask.all() else df.iloc[np.flatnonzero(mask)]
+    
+    # Other timestamp dtypes (e.g. unparsed uploads) go through pandas comparisons
+    mask = (timestamps >= start_date) & (timestamps <= end_date)
+    return df[mask]
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Returns the positional indices of the n_out points that best preserve the
+    visual shape of the (x, y) line; all indices if the series is already short.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view('i8')
+    x = x.astype(float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Pick the point forming the largest triangle with the previous pick and the next bucket's average
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+def m4_indices(x, y, n_buckets: int) -> np.ndarray:
+    """
+    M4 downsampling for a line sorted by x.
+    Splits the x range into n_buckets equal-width pixel columns and keeps the first,
+    last, min and max point of each, which draws identically at that width; all
+    indices if the series already has at most 4 points per bucket.
+    """
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view('i8')
+    x = x.astype(float)
+    y = np.nan_to_num(np.asarray(y, dtype=float))
+    n = len(x)
+    if n <= 4 * n_buckets or n_buckets < 1:
+        return np.arange(n)
+
+    span = max(x[-1] - x[0], 1.0)
+    buckets = np.minimum(((x - x[0]) / span * n_buckets).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, np.diff(buckets) != 0])
+    ends = np.r_[starts[1:], n] - 1
+
+    # Sorting by (bucket, y) puts each bucket's min first and max last within its run
+    order = np.lexsort((y, buckets))
+    return np.unique(np.concatenate([starts, ends, order[starts], order[ends]]))
+
+# Summary metrics in report order: (metric, aggregation, value key, trend key).
+# Conversion is derived from purchases and the CTR computed before it, at its place in the order.
+_SUMMARY_METRICS = (
+    ('sends', 'sum', 'total_sends', 'sends_trend'),
+    ('delivery', 'mean', 'delivery_rate', 'delivery_trend'),
+    ('opens', 'mean', 'open_rate', 'open_trend'),
+    ('ctr', 'mean', 'ctr', 'ctr_trend'),
+    ('conversion', None, 'conversion_rate', 'conversion_trend'),
+    ('revenue', 'sum', 'revenue_from_push', 'revenue_trend'),
+    ('optout', 'mean', 'optout_rate', 'optout_trend'),
+)
+
+def _lower_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    {lower-cased name: column name} in column order; the first column wins on a clash
+    """
+    lower_cols = {}
+    for col in df.columns:
+        lower_cols.setdefault(col.lower(), col)
+    return lower_cols
+
+def _value_column(lower_cols: Dict[str, str], metric: str) -> Optional[str]:
+    """
+    First non-timestamp column whose name contains one of the metric's value hints
+    """
+    from config import METRIC_VALUE_HINTS
+
+    hints = METRIC_VALUE_HINTS[metric]
+    return next((col for col_lower, col in lower_cols.items()
+                 if col_lower != 'timestamp' and any(hint in col_lower for hint in hints)), None)
+
+def _nan_sum_count(values: np.ndarray) -> Tuple[float, int]:
+    """
+    Sum and count of the non-NaN entries of a numeric array
+    Float sums accumulate in float64 whatever the storage dtype, so float32 columns total as before.
+    """
+    if values.dtype.kind != 'f':
+        return values.sum(), values.size
+    valid = ~np.isnan(values)
+    return float(values.sum(dtype=np.float64, where=valid)), int(valid.sum())
+
+def _half_split(values: pd.Series, agg: str = 'sum') -> Tuple[float, Optional[float], Optional[float]]:
+    """
+    Aggregate ('sum' or 'mean', NaN-skipping) over the whole series, plus the same
+    aggregate over its second and first halves (None for a series too short to split)
+    """
+    array = values.to_numpy()
+    if array.dtype.kind not in 'iuf':
+        array = values.to_numpy(dtype=float, na_value=np.nan)
+
+    if len(array) <= 1:
+        acc_dtype = np.float64 if array.dtype.kind == 'f' else None
+        total = np.nansum(array, dtype=acc_dtype) if agg == 'sum' else np.nanmean(array, dtype=acc_dtype)
+        return total, None, None
+
+    # One reduction per half; the whole-series aggregate is assembled from the two
+    mid_point = len(array) // 2
+    prev_sum, prev_count = _nan_sum_count(array[:mid_point])
+    curr_sum, curr_count = _nan_sum_count(array[mid_point:])
+    if agg == 'sum':
+        previous_period, current_period, total = prev_sum, curr_sum, prev_sum + curr_sum
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):  # all-NaN half -> NaN, as nanmean
+            previous_period = prev_sum / prev_count
+            current_period = curr_sum / curr_count
+            total = (prev_sum + curr_sum) / (prev_count + curr_count)
+
+    return total, current_period, previous_period
 
 def calculate_push_metrics_summary(data: Dict[str, pd.DataFrame], date_range: Tuple[datetime, datetime] = None) -> Dict:
     """
@@ -165,183 +520,54 @@ def calculate_push_metrics_summary(data: Dict[str, pd.DataFrame], date_range: Tu
     # Find data files
     files = {}
     for filename, df in filtered_data.items():
-        filename_lower = filename.lower()
-        if 'push revenue' in filename_lower:
-            files['revenue'] = df
-        elif 'pushctr' in filename_lower:
-            files['ctr'] = df
-        elif 'pushdeliveryrate' in filename_lower:
-            files['delivery'] = df
-        elif 'pushaov' in filename_lower:
-            files['aov'] = df
-        elif 'noofpurchasesattributedtopush' in filename_lower:
-            files['purchases'] = df
-        elif 'pushsends' in filename_lower or 'sends' in filename_lower:
-            files['sends'] = df
-        elif 'opens' in filename_lower or 'openrate' in filename_lower:
-            files['opens'] = df
-        elif 'optout' in filename_lower or 'unsubscribe' in filename_lower:
-            files['optout'] = df
-        elif 'campaign' in filename_lower:
-            files['campaigns'] = df
+        metric = match_metric_key(filename)
+        if metric is not None:
+            files[metric] = df
     
-    # 1. Total Push Sends
-    if 'sends' in files and not files['sends'].empty:
-        sends_df = files['sends']
-        sends_col = None
-        for col in sends_df.columns:
-            if ('send' in col.lower() or 'sent' in col.lower()) and col.lower() != 'timestamp':
-                sends_col = col
-                break
-        
-        if sends_col:
-            summary['total_sends'] = sends_df[sends_col].sum()
-            if len(sends_df) > 1:
-                mid_point = len(sends_df) // 2
-                current_period = sends_df.iloc[mid_point:][sends_col].sum()
-                previous_period = sends_df.iloc[:mid_point][sends_col].sum()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['sends_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['sends_trend'] = {'percentage': 0, 'direction': 'neutral'}
+    # Column names lower-cased once per file, shared by every metric that reads it
+    columns = {metric: _lower_columns(df) for metric, df in files.items()}
     
-    # 2. Delivery Rate (%)
-    if 'delivery' in files and not files['delivery'].empty:
-        delivery_df = files['delivery']
-        delivery_col = None
-        for col in delivery_df.columns:
-            if 'delivery' in col.lower() and col.lower() != 'timestamp':
-                delivery_col = col
-                break
-        
-        if delivery_col:
-            summary['delivery_rate'] = delivery_df[delivery_col].mean()
-            if len(delivery_df) > 1:
-                mid_point = len(delivery_df) // 2
-                current_period = delivery_df.iloc[mid_point:][delivery_col].mean()
-                previous_period = delivery_df.iloc[:mid_point][delivery_col].mean()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['delivery_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['delivery_trend'] = {'percentage': 0, 'direction': 'neutral'}
-    
-    # 3. Open Rate (%)
-    if 'opens' in files and not files['opens'].empty:
-        opens_df = files['opens']
-        opens_col = None
-        for col in opens_df.columns:
-            if ('open' in col.lower() or 'rate' in col.lower()) and col.lower() != 'timestamp':
-                opens_col = col
-                break
-        
-        if opens_col:
-            summary['open_rate'] = opens_df[opens_col].mean()
-            if len(opens_df) > 1:
-                mid_point = len(opens_df) // 2
-                current_period = opens_df.iloc[mid_point:][opens_col].mean()
-                previous_period = opens_df.iloc[:mid_point][opens_col].mean()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['open_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['open_trend'] = {'percentage': 0, 'direction': 'neutral'}
+    # Trend key -> (current, previous) half-period values, resolved in one batch below;
+    # the key is reserved in the summary now so the report order is unchanged
+    trend_periods = {}
     
-    # 4. Click-Through Rate (%)
-    if 'ctr' in files and not files['ctr'].empty:
-        ctr_df = files['ctr']
-        ctr_col = None
-        for col in ctr_df.columns:
-            if 'ctr' in col.lower() and col.lower() != 'timestamp':
-                ctr_col = col
-                break
-        
-        if ctr_col:
-            summary['ctr'] = ctr_df[ctr_col].mean()
-            if len(ctr_df) > 1:
-                mid_point = len(ctr_df) // 2
-                current_period = ctr_df.iloc[mid_point:][ctr_col].mean()
-                previous_period = ctr_df.iloc[:mid_point][ctr_col].mean()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['ctr_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['ctr_trend'] = {'percentage': 0, 'direction': 'neutral'}
+    def set_trend(trend_key, current_period, previous_period):
+        if current_period is None:
+            summary[trend_key] = {'percentage': 0, 'direction': 'neutral'}
+        else:
+            summary[trend_key] = None
+            trend_periods[trend_key] = (current_period, previous_period)
     
-    # 5. Conversion Rate (%)
-    if 'purchases' in files and 'ctr' in files:
-        purchases_df = files['purchases']
-        ctr_df = files['ctr']
-        
-        purchases_col = None
-        for col in purchases_df.columns:
-            if 'purchase' in col.lower() and col.lower() != 'timestamp':
-                purchases_col = col
-                break
-        
-        ctr_col = None
-        for col in ctr_df.columns:
-            if 'ctr' in col.lower() and col.lower() != 'timestamp':
-                ctr_col = col
-                break
-        
-        if purchases_col and ctr_col:
-            # Calculate conversion rate as purchases / clicks (simplified)
-            total_purchases = purchases_df[purchases_col].sum()
-            avg_ctr = ctr_df[ctr_col].mean()
-            # Estimate clicks from CTR and calculate conversion rate
-            if avg_ctr > 0:
+    for metric, agg, value_key, trend_key in _SUMMARY_METRICS:
+        if metric == 'conversion':
+            # Conversion Rate (%): purchases / clicks, with clicks estimated from CTR (simplified)
+            if 'purchases' not in files or 'ctr' not in files:
+                continue
+            purchases_col = _value_column(columns['purchases'], 'purchases')
+            # Average CTR from the ctr entry above; absent if the CTR file had no rows or value column
+            avg_ctr = summary.get('ctr', np.nan)
+            if purchases_col and avg_ctr > 0:
+                total_purchases, current_period, previous_period = _half_split(files['purchases'][purchases_col], 'sum')
                 estimated_clicks = total_purchases / (avg_ctr / 100)  # Rough estimate
-                conversion_rate = (total_purchases / estimated_clicks * 100) if estimated_clicks > 0 else 0
-                summary['conversion_rate'] = conversion_rate
-                
-                if len(purchases_df) > 1:
-                    mid_point = len(purchases_df) // 2
-                    current_period = purchases_df.iloc[mid_point:][purchases_col].sum()
-                    previous_period = purchases_df.iloc[:mid_point][purchases_col].sum()
-                    trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                    summary['conversion_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-                else:
-                    summary['conversion_trend'] = {'percentage': 0, 'direction': 'neutral'}
-    
-    # 6. Revenue from Push (AED)
-    if 'revenue' in files and not files['revenue'].empty:
-        revenue_df = files['revenue']
-        revenue_col = None
-        for col in revenue_df.columns:
-            if 'revenue' in col.lower() and col.lower() != 'timestamp':
-                revenue_col = col
-                break
+                summary[value_key] = (total_purchases / estimated_clicks * 100) if estimated_clicks > 0 else 0
+                set_trend(trend_key, current_period, previous_period)
+            continue
         
-        if revenue_col:
-            summary['revenue_from_push'] = revenue_df[revenue_col].sum()
-            if len(revenue_df) > 1:
-                mid_point = len(revenue_df) // 2
-                current_period = revenue_df.iloc[mid_point:][revenue_col].sum()
-                previous_period = revenue_df.iloc[:mid_point][revenue_col].sum()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['revenue_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['revenue_trend'] = {'percentage': 0, 'direction': 'neutral'}
+        if metric not in files or files[metric].empty:
+            continue
+        df = files[metric]
+        value_col = _value_column(columns[metric], metric)
+        if value_col:
+            summary[value_key], current_period, previous_period = _half_split(df[value_col], agg)
+            set_trend(trend_key, current_period, previous_period)
     
-    # 7. Opt-out Rate (%)
-    if 'optout' in files and not files['optout'].empty:
-        optout_df = files['optout']
-        optout_col = None
-        for col in optout_df.columns:
-            if ('optout' in col.lower() or 'unsubscribe' in col.lower()) and col.lower() != 'timestamp':
-                optout_col = col
-                break
-        
-        if optout_col:
-            summary['optout_rate'] = optout_df[optout_col].mean()
-            if len(optout_df) > 1:
-                mid_point = len(optout_df) // 2
-                current_period = optout_df.iloc[mid_point:][optout_col].mean()
-                previous_period = optout_df.iloc[:mid_point][optout_col].mean()
-                trend_pct, trend_dir = calculate_trend(current_period, previous_period)
-                summary['optout_trend'] = {'percentage': trend_pct, 'direction': trend_dir}
-            else:
-                summary['optout_trend'] = {'percentage': 0, 'direction': 'neutral'}
+    if trend_periods:
+        current_values, previous_values = zip(*trend_periods.values())
+        percentages, directions = calculate_trends_batch(current_values, previous_values)
+        for trend_key, trend_pct, trend_dir in zip(trend_periods, percentages, directions):
+            summary[trend_key] = {'percentage': trend_pct, 'direction': str(trend_dir)}
     
-    # 8. Top Performing Campaigns
+    # Top Performing Campaigns
     if 'campaigns' in files and not files['campaigns'].empty:
         campaigns_df = files['campaigns']
         # Count active campaigns (simplified - count rows)
@@ -350,23 +576,42 @@ def calculate_push_metrics_summary(data: Dict[str, pd.DataFrame], date_range: Tu
     
     return summary
 
+@lru_cache(maxsize=4096)
+def _format_rounded(value: float, spec: str) -> str:
+    """format() memoized; values repeat across dashboard reruns"""
+    return format(value, spec)
+
+def _format_cached(value: float, spec: str, digits: int) -> str:
+    """
+    format(value, spec), cached on the value rounded to the digits the spec shows
+    Rounding first doesn't change the output; non-finite values and zeros skip the cache.
+    """
+    value = float(value)
+    if not math.isfinite(value):
+        return format(value, spec)
+    rounded = round(value, digits)
+    # 0.0 and -0.0 are one cache key but format differently ('0' vs '-0')
+    if rounded == 0:
+        return format(rounded, spec)
+    return _format_rounded(rounded, spec)
+
 def format_currency(value: float) -> str:
     """Format value as currency (AED)"""
     if pd.isna(value):
         return "0"
-    return f"{value:,.2f}"
+    return _format_cached(value, ',.2f', 2)
 
 def format_number(value: float) -> str:
     """Format value as number with commas"""
     if pd.isna(value):
         return "0"
-    return f"{value:,.0f}"
+    return _format_cached(value, ',.0f', 0)
 
 def format_percentage(value: float) -> str:
     """Format value as percentage"""
     if pd.isna(value):
         return "0%"
-    return f"{value:.1f}%"
+    return f"{_format_cached(value, '.1f', 1)}%"
 
 def get_trend_arrow(direction: str) -> str:
     """Get trend arrow emoji"""